@@ -4,8 +4,7 @@
 
 from agents.agent import Agent
 from store import register_agent
-from helpers import get_valid_moves, execute_move, count_disc_count_change
-import copy
+from helpers import get_valid_moves, make_move_with_undo, undo_move, count_disc_count_change
 import random
 import numpy as np
 
@@ -42,10 +41,10 @@ class StudentAgent(Agent):
         best_score = float('-inf')
 
         for move in legal_moves:
-            simulated_board = copy.deepcopy(board)
-            execute_move(simulated_board, move, color)
+            undo = make_move_with_undo(board, move, color)
             # evaluate by piece difference, corner bonus, and opponent mobility
-            move_score = self.evaluate_board(simulated_board, color, opponent)
+            move_score = self.evaluate_board(board, color, opponent)
+            undo_move(board, undo)
 
             if move_score > best_score:
                 best_score = move_score
@@ -23,7 +23,7 @@ class RandomAgent(Agent):
 
         Parameters
         ----------
-        chess_board : numpy.ndarray of shape (board_size, board_size)
+        chess_board : numpy.ndarray of shape (board_size, board_size), dtype int8
             The chess board with 0 representing an empty space, 1 for black (Player 1),
             and 2 for white (Player 2).
         player : int
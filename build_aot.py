@@ -0,0 +1,28 @@
+"""
+Ahead-of-time compile the numba kernels in helpers.py into the helpers_aot extension module.
+
+helpers.py JIT compiles its kernels on first use (and caches them to __pycache__), which costs each new process
+some warmup time. Running
+
+    python build_aot.py
+
+once builds helpers_aot next to this file; helpers.py then picks it up for int8 boards and skips the JIT entirely.
+Rebuild after changing any of the kernels. Uses numba.pycc, which numba has marked as deprecated.
+"""
+import os
+
+from numba.pycc import CC
+
+import helpers
+
+cc = CC("helpers_aot")
+cc.output_dir = os.path.dirname(os.path.abspath(__file__))
+
+# Boards are int8 (see World), flattened for valid_moves and check_endgame. Players, coordinates and the board
+# size are plain ints, flat offsets are int64 and packed moves are uint16
+cc.export("valid_moves", "i8(i1[:], i8, i8, i8[:], u2[:])")(helpers._valid_moves_nb.py_func)
+cc.export("execute_move", "void(i1[:,:], i8, i8, i8, i8, i8)")(helpers._execute_move_nb.py_func)
+cc.export("check_endgame", "void(i1[:], i8[:])")(helpers._check_endgame_nb.py_func)
+
+if __name__ == "__main__":
+    cc.compile()
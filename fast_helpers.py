@@ -0,0 +1,123 @@
+from __future__ import annotations
+import functools
+import numpy as np
+from numba import njit
+
+from helpers import MoveCoordinates, get_directions, get_two_tile_directions, _unpack_move, _is_valid_move
+
+"""
+Fast_helpers.py holds board size specialized versions of the hottest helpers.py functions, for benchmarking
+against (and as a drop in for) the generic versions.
+
+The source of each kernel is generated for one board size and compiled with numba on first use, so the board
+size is a compile time constant: the 24 move offsets are unrolled and every bounds check is against a constant.
+Moves are the same packed ints as helpers.py (see helpers.encode_move), listed in the same order.
+
+Functions:
+    make_valid_moves_for    - the compiled valid move kernel for a board size
+    make_execute_move_for   - the compiled move execution kernel for a board size
+    get_valid_move_array    - same as helpers.get_valid_move_array, without the cache
+    execute_move            - same as helpers.execute_move
+"""
+
+
+def _bounds_check(row: str, col: str, dr: int, dc: int, board_size: int) -> str:
+    """
+    Source for "(row + dr, col + dc) is on a board_size board", with the checks that can never fail left out
+    """
+    checks = []
+    if dr < 0:
+        checks.append(f"{row} >= {-dr}")
+    elif dr > 0:
+        checks.append(f"{row} < {board_size - dr}")
+    if dc < 0:
+        checks.append(f"{col} >= {-dc}")
+    elif dc > 0:
+        checks.append(f"{col} < {board_size - dc}")
+    return " and ".join(checks)
+
+@functools.lru_cache(maxsize=None)
+def make_valid_moves_for(board_size: int):
+    """
+    Build the valid move kernel for board_size x board_size boards.
+
+    Returns
+    -------
+    valid_moves : function(board, player, out) -> int
+        Fills out with every valid move, packed, and returns how many were written.
+        out must have room for 24 moves per disc owned by player.
+    """
+    lines = [
+        "def valid_moves(board, player, out):",
+        "    count = 0",
+        f"    for r in range({board_size}):",
+        f"        for c in range({board_size}):",
+        "            if board[r, c] != player:",
+        "                continue",
+    ]
+    for dr, dc in get_directions() + get_two_tile_directions():
+        lines += [
+            f"            if {_bounds_check('r', 'c', dr, dc, board_size)} and board[r + {dr}, c + {dc}] == 0:",
+            f"                out[count] = (r << 12) | (c << 8) | ((r + {dr}) << 4) | (c + {dc})",
+            "                count += 1",
+        ]
+    lines.append("    return count")
+
+    namespace = {}
+    exec("\n".join(lines), namespace)
+    return njit(nogil=True)(namespace["valid_moves"])
+
+@functools.lru_cache(maxsize=None)
+def make_execute_move_for(board_size: int):
+    """
+    Build the move execution kernel for board_size x board_size boards.
+
+    Returns
+    -------
+    execute_move : function(board, r_src, c_src, r_dest, c_dest, player)
+        Applies an already validated move to board in place.
+    """
+    lines = [
+        "def execute_move(board, r_src, c_src, r_dest, c_dest, player):",
+        "    opponent = 3 - player",
+        "    board[r_dest, c_dest] = player",
+    ]
+    for dr, dc in get_directions():
+        lines += [
+            f"    if {_bounds_check('r_dest', 'c_dest', dr, dc, board_size)} and board[r_dest + {dr}, c_dest + {dc}] == opponent:",
+            f"        board[r_dest + {dr}, c_dest + {dc}] = player",
+        ]
+    lines += [
+        "    if abs(r_dest - r_src) == 2 or abs(c_dest - c_src) == 2:",
+        "        board[r_src, c_src] = 0",
+    ]
+
+    namespace = {}
+    exec("\n".join(lines), namespace)
+    return njit(nogil=True)(namespace["execute_move"])
+
+def get_valid_move_array(chess_board, player: int) -> np.ndarray:
+    """
+    Get all valid moves given the chess board and player, using the kernel specialized for its size.
+
+    Returns
+    -------
+    valid_moves : np.ndarray of shape (num_moves,), dtype uint16
+        One packed move (see helpers.encode_move) per valid move.
+    """
+    out = np.empty(24 * np.count_nonzero(chess_board == player), dtype=np.uint16)
+    count = make_valid_moves_for(chess_board.shape[0])(chess_board, player, out)
+    return out[:count]
+
+def execute_move(chess_board, move_coords: MoveCoordinates | int, player: int):
+    """
+    Play the move specified by altering the chess_board, using the kernel specialized for its size.
+    Same contract as helpers.execute_move.
+    """
+    # Validate the raw coordinates, packing out of range ones first could alias them onto a real move
+    r_src, c_src, r_dest, c_dest = _unpack_move(move_coords)
+
+    if not _is_valid_move(chess_board, r_src, c_src, r_dest, c_dest, player): # Throw an exception instead of executing an invalid move. This exception should be handled in the simulator logic
+        raise Exception(f"Executing an invalid move! Player {player} is moving from ({r_src},{c_src}) to ({r_dest},{c_dest})")
+
+    make_execute_move_for(chess_board.shape[0])(chess_board, r_src, c_src, r_dest, c_dest, player)
@@ -1,5 +1,14 @@
+from __future__ import annotations
 
+import functools
 import numpy as np
+from numba import njit
+
+try:
+    # Ahead-of-time compiled kernels, built by running build_aot.py. Without it the @njit kernels below are used.
+    import helpers_aot
+except ImportError:
+    helpers_aot = None
 
 """
 Helpers.py is a collection of functions that primarily make up the Ataxx game logic.
@@ -8,21 +17,33 @@ all of what you'll need to simulate games in your search method.
 
 Classes:
     MoveCoordinates         - a data class for storing (row, column) tuples for both the source and the destination of a move.
+    BitBoard                - the board as one int bitmask per player, an alternative representation for your search.
+    ByteBoard               - the board as a flat bytearray, a numpy free chess_board for simulation on small boards.
 
 Functions:
+    encode_move             - pack a move into a single int, (r_src << 12) | (c_src << 8) | (r_dest << 4) | c_dest
+    decode_move             - unpack an int from encode_move back into (r_src, c_src, r_dest, c_dest)
     get_directions          - a simple helper to deal with the geometry of single tile moves ("duplications")
     get_two_tile_directions - a simple helper to deal with the geometry of double tile moves ("jumps")
     check_move_validity     - is this a valid move for a given player and chess_board
     count_disc_count_change - how many discs are gained by this moved (flipped or duplicates)
     execute_move            - update the chess_board by simulating a move
+    make_move_with_undo     - execute_move, returning what's needed to take it back
+    undo_move               - take back a move made with make_move_with_undo
     check_endgame           - check for termination, who's won but also helpful to score non-terminated games
     get_valid_moves         - use this to get the children in your tree
+    get_valid_move_array    - same as get_valid_moves, but as a uint16 array of packed moves (see encode_move)
+    clear_valid_move_cache  - forget the positions cached by get_valid_move_array, e.g. between games
     random_move             - basis of the random agent and can be used to simulate play
+    seed_random_move        - reseed the random stream random_move draws from
 
     For all, the chess_board is an np array of integers, size nxn and integer values indicating square occupancies.
+    The World stores it as np.int8; any integer dtype works, but int8 boards are the fastest to scan and copy.
     The current player is (1: Blue, 2: Brown), 0's in the board mean empty squares. 3's in the board mean obstacles.
     Move coords is MoveCoordinates instance containing two tuples - source and destination. Each tuple holds [row,col], zero indexed 
     such that valid entries are [0,board_size-1]
+    Anywhere a MoveCoordinates is accepted, a packed move from encode_move is accepted too. Packed moves are much
+    cheaper to create and store, so prefer them inside your search.
 """
 
 
@@ -48,36 +69,256 @@ class MoveCoordinates:
     def get_dest(self) -> tuple[int, int]:
         return (self.row_dest, self.col_dest)
 
+    '''
+    Return this move packed into a single int (see encode_move)
+    '''
+    def to_packed(self) -> int:
+        return encode_move(self.row_src, self.col_src, self.row_dest, self.col_dest)
+
+    '''
+    Build a MoveCoordinates from a packed move (see encode_move)
+    '''
+    @classmethod
+    def from_packed(cls, move: int) -> "MoveCoordinates":
+        r_src, c_src, r_dest, c_dest = decode_move(move)
+        return cls(src=(r_src, c_src), dest=(r_dest, c_dest))
+
+
+def encode_move(r_src: int, c_src: int, r_dest: int, c_dest: int) -> int:
+    """
+    Pack a move into a single int. Each coordinate gets 4 bits, which covers boards up to 16x16.
+
+    Returns
+    -------
+    int
+        (r_src << 12) | (c_src << 8) | (r_dest << 4) | c_dest
+    """
+    return (r_src << 12) | (c_src << 8) | (r_dest << 4) | c_dest
+
+def decode_move(move: int) -> tuple[int, int, int, int]:
+    """
+    Unpack a move packed by encode_move.
+
+    Returns
+    -------
+    tuple of int
+        (r_src, c_src, r_dest, c_dest)
+    """
+    move = int(move)
+    return (move >> 12) & 0xF, (move >> 8) & 0xF, (move >> 4) & 0xF, move & 0xF
+
+def _unpack_move(move_coords) -> tuple[int, int, int, int]:
+    """
+    (r_src, c_src, r_dest, c_dest) of either a MoveCoordinates or a packed move
+    """
+    if isinstance(move_coords, MoveCoordinates):
+        return move_coords.row_src, move_coords.col_src, move_coords.row_dest, move_coords.col_dest
+    return decode_move(move_coords)
+
 
 
-def get_directions() -> list[tuple]:
+# Direction vectors are built once here, rather than on every call
+_DIRS_8 = ((-1, 0), (1, 0), (0, -1), (0, 1), (-1, -1), (-1, 1), (1, -1), (1, 1))
+# TODO: is there a more logical way to organize this lol 
+_TWO_TILE_DIRS = ((-2, 0), (2, 0), (0, -2), (0, 2), 
+                  (-2, 1), (2, 1), (1, -2), (1, 2), 
+                  (-2, -1), (2, -1), (-1, -2), (-1, 2),
+                  (-2, -2), (-2, 2), (2, -2), (2, 2))
+_ALL_DIRS = _DIRS_8 + _TWO_TILE_DIRS
+# Row and column components of _DIRS_8
+_DR = np.array([dr for dr, _ in _DIRS_8])
+_DC = np.array([dc for _, dc in _DIRS_8])
+
+def get_directions() -> tuple[tuple[int, int], ...]:
     """
     Get all directions (8 directions: up, down, left, right, and diagonals)
 
     Returns
     -------
-    list of tuple
-        List of direction vectors
+    tuple of tuple
+        Direction vectors
     """
-    return [(-1, 0), (1, 0), (0, -1), (0, 1), (-1, -1), (-1, 1), (1, -1), (1, 1)]
+    return _DIRS_8
 
-def get_two_tile_directions() -> list[tuple]: 
+def get_two_tile_directions() -> tuple[tuple[int, int], ...]: 
     """
     Get all possible movement vectors for a 2 tile move (16 total)
 
     Returns
     -------
-    list of tuple
-        List of direction vectors
+    tuple of tuple
+        Direction vectors
+    """
+    return _TWO_TILE_DIRS
+
+
+# Offsets for all 24 candidate moves: 8 single tile duplications followed by 16 two tile jumps
+_OFFSETS = np.array(_ALL_DIRS, dtype=np.int8)
+# The same offsets as steps in a flattened board, per board size
+_FLAT_OFFSETS_CACHE: dict[int, np.ndarray] = {}
+
+def _flat_offsets(board_size: int) -> np.ndarray:
+    """
+    _OFFSETS as dr * board_size + dc, for indexing a flattened board_size x board_size board.
+    """
+    if board_size not in _FLAT_OFFSETS_CACHE:
+        _FLAT_OFFSETS_CACHE[board_size] = np.array([dr * board_size + dc for dr, dc in _ALL_DIRS], dtype=np.int64)
+    return _FLAT_OFFSETS_CACHE[board_size]
+
+@njit(cache=True, nogil=True)
+def _valid_moves_nb(board_flat, n, player, flat_offsets, out):
+    """
+    Fill out with every valid move, packed as in encode_move, and return how many were written.
+    board_flat is an n x n board flattened in row major order, flat_offsets is _flat_offsets(n).
+    out must have room for 24 moves per disc owned by player.
+    """
+    count = 0
+    i = 0
+    for r in range(n):
+        for c in range(n):
+            if board_flat[i] == player:
+                for k in range(_OFFSETS.shape[0]):
+                    # Bounds are checked on (row, col) so moves can't wrap around an edge of the flat board
+                    rd = r + _OFFSETS[k, 0]
+                    cd = c + _OFFSETS[k, 1]
+                    if rd < 0 or rd >= n or cd < 0 or cd >= n:
+                        continue
+                    if board_flat[i + flat_offsets[k]] != 0:
+                        continue
+                    out[count] = (r << 12) | (c << 8) | (rd << 4) | cd
+                    count += 1
+            i += 1
+    return count
+
+@njit(cache=True, nogil=True)
+def _execute_move_nb(board, r_src, c_src, r_dest, c_dest, player):
+    """
+    Apply an already validated move to board in place.
+    """
+    n_rows, n_cols = board.shape
+    opponent = 3 - player
+    board[r_dest, c_dest] = player
+    # The first 8 offsets are the adjacent squares, flip any opponent discs there
+    for k in range(8):
+        r = r_dest + _OFFSETS[k, 0]
+        c = c_dest + _OFFSETS[k, 1]
+        if r < 0 or r >= n_rows or c < 0 or c >= n_cols:
+            continue
+        if board[r, c] == opponent:
+            board[r, c] = player
+    # If the move is two-tiles, empty the source tile
+    if abs(r_dest - r_src) == 2 or abs(c_dest - c_src) == 2:
+        board[r_src, c_src] = 0
+
+@njit(cache=True, nogil=True)
+def _check_endgame_nb(board_flat, counts):
+    """
+    Fill counts with the number of empty, player 1 and player 2 squares on a flattened board, in one pass.
     """
-    # TODO: is there a more logical way to organize this lol 
-    return [(-2, 0), (2, 0), (0, -2), (0, 2), 
-            (-2, 1), (2, 1), (1, -2), (1, 2), 
-            (-2, -1), (2, -1), (-1, -2), (-1, 2),
-            (-2, -2), (-2, 2), (2, -2), (2, 2)] 
+    counts[:] = 0
+    for i in range(board_flat.shape[0]):
+        if board_flat[i] < 3:
+            counts[board_flat[i]] += 1
+
+# make_move_with_undo's undo record holds r_src, c_src, r_dest, c_dest, player and the flip count,
+# followed by the flat indices of up to 8 flipped discs
+_UNDO_FLIPPED = 6
 
+@njit(cache=True, nogil=True)
+def _make_move_undo_nb(board, r_src, c_src, r_dest, c_dest, player, undo):
+    """
+    Validate and apply a move to board in place, recording what changed in undo (see make_move_with_undo).
+    Returns the number of flipped discs, or -1 (leaving board untouched) if the move is invalid.
+    """
+    n = board.shape[0] # Boards are always square
+    # Same checks as _is_valid_move: both squares on the board, dest 1 or 2 tiles away and empty, src owned
+    if r_src < 0 or r_src >= n or c_src < 0 or c_src >= n:
+        return -1
+    if r_dest < 0 or r_dest >= n or c_dest < 0 or c_dest >= n:
+        return -1
+    dist = max(abs(r_dest - r_src), abs(c_dest - c_src))
+    if dist < 1 or dist > 2:
+        return -1
+    if board[r_dest, c_dest] != 0 or board[r_src, c_src] != player:
+        return -1
 
-def check_move_validity(chess_board, move_coords: MoveCoordinates, player: int) -> bool:
+    opponent = 3 - player
+    board[r_dest, c_dest] = player
+    count = 0
+    for k in range(8):
+        r = r_dest + _OFFSETS[k, 0]
+        c = c_dest + _OFFSETS[k, 1]
+        if r < 0 or r >= n or c < 0 or c >= n:
+            continue
+        if board[r, c] == opponent:
+            board[r, c] = player
+            undo[_UNDO_FLIPPED + count] = r * n + c
+            count += 1
+    # If the move is two-tiles, empty the source tile
+    if dist == 2:
+        board[r_src, c_src] = 0
+
+    undo[0] = r_src
+    undo[1] = c_src
+    undo[2] = r_dest
+    undo[3] = c_dest
+    undo[4] = player
+    undo[5] = count
+    return count
+
+@njit(cache=True, nogil=True)
+def _undo_move_nb(board, undo):
+    """
+    Restore board from an undo record written by _make_move_undo_nb.
+    """
+    n = board.shape[0]
+    opponent = 3 - undo[4]
+    for k in range(undo[5]):
+        board[undo[_UNDO_FLIPPED + k] // n, undo[_UNDO_FLIPPED + k] % n] = opponent
+    board[undo[2], undo[3]] = 0
+    # src always held player's disc, a jump emptied it
+    board[undo[0], undo[1]] = undo[4]
+
+def _use_aot(chess_board) -> bool:
+    """
+    Whether chess_board can go through helpers_aot, which is only compiled for int8 boards.
+    """
+    return helpers_aot is not None and chess_board.dtype == np.int8
+
+# Per board size tables, built on first use. Index with r * board_size + c.
+_NEIGHBOR_CACHE: dict[int, list[tuple[np.ndarray, np.ndarray]]] = {}
+_VALID_OFFSETS_CACHE: dict[int, list[frozenset[tuple[int, int]]]] = {}
+
+def _neighbors(board_size: int) -> list[tuple[np.ndarray, np.ndarray]]:
+    """
+    For every square, the rows and columns of its (up to 8) on-board adjacent squares, ready for fancy indexing.
+    """
+    if board_size not in _NEIGHBOR_CACHE:
+        _NEIGHBOR_CACHE[board_size] = []
+        for r in range(board_size):
+            for c in range(board_size):
+                rows, cols = r + _DR, c + _DC
+                on_board = (rows >= 0) & (rows < board_size) & (cols >= 0) & (cols < board_size)
+                _NEIGHBOR_CACHE[board_size].append((rows[on_board], cols[on_board]))
+    return _NEIGHBOR_CACHE[board_size]
+
+def _valid_offsets(board_size: int) -> list[frozenset[tuple[int, int]]]:
+    """
+    For every square, the on-board (row, col) destinations reachable from it by a single or two tile move.
+    """
+    if board_size not in _VALID_OFFSETS_CACHE:
+        _VALID_OFFSETS_CACHE[board_size] = [
+            frozenset(
+                (r + dr, c + dc)
+                for dr, dc in _ALL_DIRS
+                if 0 <= r + dr < board_size and 0 <= c + dc < board_size
+            )
+            for r in range(board_size)
+            for c in range(board_size)
+        ]
+    return _VALID_OFFSETS_CACHE[board_size]
+
+def check_move_validity(chess_board, move_coords: MoveCoordinates | int, player: int) -> bool:
     """
     Check if the move described by move_coords is valid given player and chess_board
 
@@ -86,35 +327,33 @@ def check_move_validity(chess_board, move_coords: MoveCoordinates, player: int)
     bool
         Whether the move is valid.
     """
-    src_tile = move_coords.get_src()
-    dest_tile = move_coords.get_dest()
+    return _is_valid_move(chess_board, *_unpack_move(move_coords), player)
+
+def _is_valid_move(chess_board, r_src: int, c_src: int, r_dest: int, c_dest: int, player: int) -> bool:
+    """
+    check_move_validity on an already unpacked move
+    """
+    n = chess_board.shape[0] # Boards are always square
 
-    # Check src and dest are on the board
-    if not (0 <= src_tile[0] < chess_board.shape[0] and 0 <= src_tile[1] < chess_board.shape[1]):
+    # Check src is on the board
+    if not (0 <= r_src < n and 0 <= c_src < n):
         return False
-    if not (0 <= dest_tile[0] < chess_board.shape[0] and 0 <= dest_tile[1] < chess_board.shape[1]):
+
+    # Check dest is on the board and a valid distance away from src
+    if not (r_dest, c_dest) in _valid_offsets(n)[r_src * n + c_src]:
         return False
 
     # Check dest is empty
-    if not (chess_board[dest_tile[0], dest_tile[1]] == 0):
+    if not (chess_board[r_dest, c_dest] == 0):
         return False 
 
     # Check src is owned by player
-    if not (chess_board[src_tile[0], src_tile[1]] == player):
+    if not (chess_board[r_src, c_src] == player):
         return False 
-    
-    # Check if distance between discs is in the set of valid directions
-    valid_distances_list = get_directions()
-    valid_distances_list.extend(get_two_tile_directions())
-
-    move_dist = (dest_tile[0] - src_tile[0], dest_tile[1] - src_tile[1])
 
-    if not move_dist in valid_distances_list:
-        return False
-    
     return True
 
-def count_disc_count_change(chess_board, move_coords: MoveCoordinates, player: int):
+def count_disc_count_change(chess_board, move_coords: MoveCoordinates | int, player: int):
     """
     How many discs are gained by the move specified in move_coords. Total = (opponent's discs captured) + (duplication disc for single tile moves)
 
@@ -124,65 +363,66 @@ def count_disc_count_change(chess_board, move_coords: MoveCoordinates, player: i
         The change in player disc count from this move.
         -1 indicates any form of invalid move.
     """
-    opponent_map = {0: 1, 1: 0} # This lets us quickly access the value corresponding to the opponent on the board based on current player number
+    opponent = 3 - player # Players are 1 and 2, so this is the opponent's value on the board
 
-    r_dest, c_dest = move_coords.get_dest()
+    r_src, c_src, r_dest, c_dest = _unpack_move(move_coords)
 
-    if not check_move_validity(chess_board, move_coords, player):
+    if not _is_valid_move(chess_board, r_src, c_src, r_dest, c_dest, player):
         return -1
     
-    discs_gained = 0
-
-    # Check if move captures any opponent discs in any direction
-    for dir in get_directions():
-        adj_tile = (r_dest + dir[0], c_dest + dir[1])
-
-        # Check if adjacent tile is on the board
-        if not (0 <= adj_tile[0] < chess_board.shape[0] and 0 <= adj_tile[1] < chess_board.shape[0]):
-            return -1
-
-        # If the tile, is an opponent, count it
-        if chess_board[adj_tile[0], adj_tile[1]] == opponent_map[player]:
-            discs_gained += 1
+    # Count the opponent's discs adjacent to dest, these are all captured
+    n = chess_board.shape[0] # Boards are always square
+    rows, cols = _neighbors(n)[r_dest * n + c_dest]
+    discs_gained = int(np.count_nonzero(chess_board[rows, cols] == opponent))
 
     # If the move is single tile, count an extra disc for "duplication"
-    r_src, c_src = move_coords.get_dest()
-    if not ( (np.abs(r_dest - r_src) == 2) or (np.abs(c_dest - c_src) == 2) ):
+    if not (abs(r_dest - r_src) == 2 or abs(c_dest - c_src) == 2):
         discs_gained += 1
 
     return discs_gained
 
-def execute_move(chess_board, move_coords: MoveCoordinates, player: int):
+def execute_move(chess_board, move_coords: MoveCoordinates | int, player: int):
     """
     Play the move specified by altering the chess_board.
     Note that chess_board is a pass-by-reference in/output parameter.
-    Consider copy.deepcopy() of the chess_board if you want to consider numerous possibilities.
+    To consider numerous possibilities, use make_move_with_undo and undo_move rather than copying the chess_board.
     """
-    opponent_map = {1: 2, 2: 1} # This lets us quickly access the value corresponding to the opponent on the board based on current player number
+    r_src, c_src, r_dest, c_dest = _unpack_move(move_coords)
 
-    if not check_move_validity(chess_board, move_coords, player): # Throw an exception instead of executing an invalid move. This exception should be handled in the simulator logic
-        raise Exception(f"Executing an invalid move! Player {player} is moving from ({move_coords.row_src},{move_coords.col_src}) to ({move_coords.row_dest},{move_coords.col_dest})")
+    if not _is_valid_move(chess_board, r_src, c_src, r_dest, c_dest, player): # Throw an exception instead of executing an invalid move. This exception should be handled in the simulator logic
+        raise Exception(f"Executing an invalid move! Player {player} is moving from ({r_src},{c_src}) to ({r_dest},{c_dest})")
 
-    r_dest, c_dest = move_coords.get_dest()
-    chess_board[r_dest, c_dest] = player
+    # Place the disc, flip captured opponent discs and empty the source tile of a jump
+    if _use_aot(chess_board):
+        helpers_aot.execute_move(chess_board, r_src, c_src, r_dest, c_dest, player)
+    else:
+        _execute_move_nb(chess_board, r_src, c_src, r_dest, c_dest, player)
 
-    # Flip opponent's discs in all directions where captures occur
-    for direction in get_directions():
-        adj_tile = (r_dest + direction[0], c_dest + direction[1])
 
-        # Check if tile is on the board
-        if not (0 <= adj_tile[0] < chess_board.shape[0] and 0 <= adj_tile[1] < chess_board.shape[0]):
-            continue
+def make_move_with_undo(chess_board, move_coords: MoveCoordinates | int, player: int) -> np.ndarray:
+    """
+    Same as execute_move, but also return what changed so undo_move can restore chess_board in place.
+    Inside a search this replaces copying the board before every move: make the move, explore, then undo it.
 
-        # If the tile, is an opponent, flip it
-        if chess_board[adj_tile[0], adj_tile[1]] == opponent_map[player]:
-            chess_board[adj_tile[0], adj_tile[1]] = player
+    Returns
+    -------
+    undo : np.ndarray of shape (14,), dtype int64
+        The undo record to pass to undo_move: r_src, c_src, r_dest, c_dest, player, the number of flipped
+        discs, then the flat index (r * board_size + c) of each flipped disc.
+    """
+    r_src, c_src, r_dest, c_dest = _unpack_move(move_coords)
 
-    # If the move is two-tiles, empty the source tile
-    r_src, c_src = move_coords.get_src()
-    if (np.abs(r_dest - r_src) == 2) or (np.abs(c_dest - c_src) == 2):
-        chess_board[r_src, c_src] = 0
+    undo = np.empty(_UNDO_FLIPPED + 8, dtype=np.int64)
+    if _make_move_undo_nb(chess_board, r_src, c_src, r_dest, c_dest, player, undo) < 0: # Throw an exception instead of executing an invalid move. This exception should be handled in the simulator logic
+        raise Exception(f"Executing an invalid move! Player {player} is moving from ({r_src},{c_src}) to ({r_dest},{c_dest})")
 
+    return undo
+
+def undo_move(chess_board, undo: np.ndarray):
+    """
+    Take back a move made by make_move_with_undo, in place. Moves must be undone in reverse order.
+    """
+    _undo_move_nb(chess_board, undo)
 
 def check_endgame(chess_board):
     """
@@ -200,24 +440,78 @@ def check_endgame(chess_board):
         The score of player 2.
     """
 
-    is_endgame = False
+    # One pass over the board counts empties, player 1 and player 2 discs together
+    counts = np.empty(3, dtype=np.int64)
+    if _use_aot(chess_board):
+        helpers_aot.check_endgame(chess_board.ravel(), counts)
+    else:
+        _check_endgame_nb(chess_board.ravel(), counts)
 
-    if np.sum(chess_board == 0) == 0:
-        is_endgame = True  # When there are no spaces left, the game is over, score is current piece count
+    # When there are no spaces left, the game is over, score is current piece count
+    is_endgame = bool(counts[0] == 0)
 
-    p0_score = np.sum(chess_board == 1)
-    p1_score = np.sum(chess_board == 2)
+    p0_score = int(counts[1])
+    p1_score = int(counts[2])
 
     # Handle special case where one player is totally eliminated
     if p0_score == 0:
-        p1_score = chess_board.shape[0] * chess_board.shape[1]
+        p1_score = chess_board.size
         is_endgame = True
     elif p1_score == 0:
-        p0_score = chess_board.shape[0] * chess_board.shape[1]
+        p0_score = chess_board.size
         is_endgame = True
 
     return is_endgame, p0_score, p1_score
 
+def get_valid_move_array(chess_board, player: int, cache: bool = True) -> np.ndarray:
+    """
+    Get all valid moves given the chess board and player, without building MoveCoordinates.
+    Prefer this over get_valid_moves inside search loops.
+    With cache=True results are cached per position, so repeated queries (e.g. transpositions in a tree search)
+    skip the scan. Positions that are rarely revisited, like random rollouts, should pass cache=False, since a
+    cache miss costs more than the scan itself.
+
+    Returns
+    -------
+    valid_moves : np.ndarray of shape (num_moves,), dtype uint16
+        One packed move (see encode_move) per valid move. With cache=True the array is shared with the cache
+        and read-only.
+    """
+    if not cache:
+        # ravel is a view of C-contiguous boards, and the scan only reads it
+        return _scan_valid_moves(chess_board.ravel(), chess_board.shape[0], player)
+    return _valid_move_array_cached(chess_board.tobytes(), chess_board.dtype.str, chess_board.shape, int(player))
+
+def _scan_valid_moves(board_flat, board_size: int, player: int) -> np.ndarray:
+    """
+    Run the valid move kernel over a flattened board_size x board_size board
+    """
+    # Room for 24 moves from every square, allocating is cheaper than counting player's discs first
+    out = np.empty(24 * board_flat.shape[0], dtype=np.uint16)
+    if _use_aot(board_flat):
+        count = helpers_aot.valid_moves(board_flat, board_size, player, _flat_offsets(board_size), out)
+    else:
+        count = _valid_moves_nb(board_flat, board_size, player, _flat_offsets(board_size), out)
+    return out[:count]
+
+@functools.lru_cache(maxsize=65536)
+def _valid_move_array_cached(board_bytes: bytes, dtype: str, shape: tuple[int, int], player: int) -> np.ndarray:
+    """
+    get_valid_move_array keyed on the raw board bytes, so it can be memoized
+    """
+    # The bytes are already the board flattened in row major order.
+    # Copy so the cache only holds on to the moves, not the whole scratch buffer
+    valid_moves = _scan_valid_moves(np.frombuffer(board_bytes, dtype=dtype), shape[0], player).copy()
+    valid_moves.flags.writeable = False
+    return valid_moves
+
+def clear_valid_move_cache():
+    """
+    Empty the get_valid_move_array cache. The World calls this when a game starts, so the cache only ever holds
+    positions from the current game.
+    """
+    _valid_move_array_cached.cache_clear()
+
 def get_valid_moves(chess_board,player:int) -> list[MoveCoordinates]:
     """
     Get all valid moves given the chess board and player.
@@ -229,28 +523,43 @@ def get_valid_moves(chess_board,player:int) -> list[MoveCoordinates]:
 
     """
 
-    board_size = chess_board.shape[0]
-    valid_moves = []
-    for r in range(board_size):
-        for c in range(board_size):
-            # Check square has a player's disc
-            if chess_board[r, c] == player:
-                src = (r,c)
-                # loop over all possible moves
-                candidate_move_list = get_directions()
-                candidate_move_list.extend(get_two_tile_directions())
+    return [MoveCoordinates.from_packed(move) for move in get_valid_move_array(chess_board, player).tolist()]
+
+class _RandomStream:
+    """
+    Draws uniform floats from a np.random.Generator a block at a time, so picking a random index is a list pop
+    instead of a call through numpy (and the global RNG) per move.
+    """
+    def __init__(self, rng: np.random.Generator, block_size: int = 4096):
+        self.rng = rng
+        self.block_size = block_size
+        self.block = []
+
+    '''
+    Return a random int in [0, high)
+    '''
+    def integers(self, high: int) -> int:
+        # pop is atomic, so threads sharing the stream just refill and retry if another thread drained the block
+        while True:
+            try:
+                return int(self.block.pop() * high)
+            except IndexError:
+                self.block = self.rng.random(self.block_size).tolist()
 
-                for dir in candidate_move_list:
-                    dest_tile = (r + dir[0], c + dir[1])
-                    valid_move = MoveCoordinates(src=(r,c), dest=dest_tile)
-                    if check_move_validity(chess_board, valid_move, player):
-                        valid_moves.append(valid_move)
+_random_stream = _RandomStream(np.random.default_rng())
 
-    return valid_moves
+def seed_random_move(seed=None):
+    """
+    Reseed the stream random_move draws from when it isn't given an rng.
+    seed is anything np.random.default_rng accepts, e.g. an int or a np.random.SeedSequence.
+    """
+    global _random_stream
+    _random_stream = _RandomStream(np.random.default_rng(seed))
 
-def random_move(chess_board, player: int) -> MoveCoordinates:
+def random_move(chess_board, player: int, rng: np.random.Generator = None) -> MoveCoordinates:
     """
     random move from the list of valid moves.
+    Draws from rng if given, otherwise from a module level stream (see seed_random_move).
 
     Returns
 
@@ -260,11 +569,337 @@ def random_move(chess_board, player: int) -> MoveCoordinates:
 
     """
 
-    valid_moves = get_valid_moves(chess_board, player)
+    # Random play rarely revisits a position, so skip the cache
+    valid_moves = get_valid_move_array(chess_board, player, cache=False)
 
     if len(valid_moves) == 0:
         # If no valid moves are available, return None
         print(f"No valid moves left for player {player}.")
         return None
-    
-    return valid_moves[np.random.randint(len(valid_moves))]
+
+    if rng is None:
+        index = _random_stream.integers(len(valid_moves))
+    else:
+        index = rng.integers(len(valid_moves))
+    return MoveCoordinates.from_packed(valid_moves[index])
+
+# Per board size bitboard tables, built on first use
+_SHIFT_CACHE: dict[int, tuple[tuple[int, int, int], ...]] = {}
+_NEIGHBOR_MASK_CACHE: dict[int, list[int]] = {}
+
+def _shifts(board_size: int) -> tuple[tuple[int, int, int], ...]:
+    """
+    For each of the 24 offsets (in _ALL_DIRS order), (left shift, right shift, destination mask).
+    Shifting a bitboard by these moves every disc by the offset, and the mask drops discs that wrapped
+    around a board edge (or fell off the top or bottom).
+    """
+    if board_size not in _SHIFT_CACHE:
+        shifts = []
+        for dr, dc in _ALL_DIRS:
+            amount = dr * board_size + dc
+            mask = 0
+            for r in range(board_size):
+                for c in range(board_size):
+                    if 0 <= r - dr < board_size and 0 <= c - dc < board_size:
+                        mask |= 1 << (r * board_size + c)
+            shifts.append((max(amount, 0), max(-amount, 0), mask))
+        _SHIFT_CACHE[board_size] = tuple(shifts)
+    return _SHIFT_CACHE[board_size]
+
+def _neighbor_masks(board_size: int) -> list[int]:
+    """
+    For every square, a bitmask of its (up to 8) on-board adjacent squares.
+    """
+    if board_size not in _NEIGHBOR_MASK_CACHE:
+        masks = []
+        for r in range(board_size):
+            for c in range(board_size):
+                mask = 0
+                for dr, dc in _DIRS_8:
+                    if 0 <= r + dr < board_size and 0 <= c + dc < board_size:
+                        mask |= 1 << ((r + dr) * board_size + c + dc)
+                masks.append(mask)
+        _NEIGHBOR_MASK_CACHE[board_size] = masks
+    return _NEIGHBOR_MASK_CACHE[board_size]
+
+
+class BitBoard:
+    """
+    BitBoard stores the board from one player's point of view as three int bitmasks: the player's discs (mine),
+    the opponent's discs (opp) and the obstacles (blocked). Square (r, c) is bit r * n + c.
+    Python ints are unbounded, so this works for every board size, not only those that fit in 64 bits.
+
+    Move generation and execution are shifts and masks instead of a scan over the board, and positions are cheap
+    to copy and hash. These run as interpreted Python though, so for plain rollouts the numba backed
+    get_valid_move_array and execute_move on a chess_board are faster. Moves are packed ints (see encode_move),
+    and execute_move does not validate them, so only play moves from valid_moves.
+    """
+    __slots__ = ("mine", "opp", "blocked", "n")
+
+    def __init__(self, mine: int, opp: int, blocked: int, n: int):
+        self.mine = mine
+        self.opp = opp
+        self.blocked = blocked
+        self.n = n
+
+    '''
+    Build a BitBoard of chess_board from player's point of view
+    '''
+    @classmethod
+    def from_numpy(cls, chess_board, player: int) -> "BitBoard":
+        mine = opp = blocked = 0
+        for i, square in enumerate(chess_board.ravel().tolist()):
+            if square == player:
+                mine |= 1 << i
+            elif square == 3 - player:
+                opp |= 1 << i
+            elif square == 3:
+                blocked |= 1 << i
+        return cls(mine, opp, blocked, chess_board.shape[0])
+
+    '''
+    Return the board as a numpy chess_board with mine stored as player, e.g. for the UI or the other helpers
+    '''
+    def to_numpy(self, player: int) -> np.ndarray:
+        n = self.n
+        chess_board = np.zeros(n * n, dtype=np.int8)
+        for i in range(n * n):
+            bit = 1 << i
+            if self.mine & bit:
+                chess_board[i] = player
+            elif self.opp & bit:
+                chess_board[i] = 3 - player
+            elif self.blocked & bit:
+                chess_board[i] = 3
+        return chess_board.reshape(n, n)
+
+    '''
+    Return a copy of this board
+    '''
+    def copy(self) -> "BitBoard":
+        return BitBoard(self.mine, self.opp, self.blocked, self.n)
+
+    '''
+    Return this board from the opponent's point of view
+    '''
+    def swapped(self) -> "BitBoard":
+        return BitBoard(self.opp, self.mine, self.blocked, self.n)
+
+    '''
+    Return the bitmask of empty squares
+    '''
+    def empty(self) -> int:
+        return ~(self.mine | self.opp | self.blocked) & ((1 << (self.n * self.n)) - 1)
+
+    def valid_moves(self) -> list[int]:
+        """
+        Get all valid moves for mine, as packed moves (see encode_move).
+
+        Returns
+        -------
+        valid_moves : [int]
+        """
+        n = self.n
+        empty = self.empty()
+        valid_moves = []
+        for left, right, mask in _shifts(n):
+            # Every empty square that one of mine lands on when moved by this offset
+            targets = ((self.mine << left) >> right) & mask & empty
+            while targets:
+                bit = targets & -targets
+                targets ^= bit
+                dest = bit.bit_length() - 1
+                src = dest - left + right
+                valid_moves.append(encode_move(src // n, src % n, dest // n, dest % n))
+        return valid_moves
+
+    def execute_move(self, move: int):
+        """
+        Play a packed move for mine, in place. The move must come from valid_moves.
+        """
+        r_src, c_src, r_dest, c_dest = decode_move(move)
+        n = self.n
+        dest = r_dest * n + c_dest
+
+        # Place the disc and take every adjacent opponent disc
+        flips = _neighbor_masks(n)[dest] & self.opp
+        self.mine |= (1 << dest) | flips
+        self.opp &= ~flips
+
+        # If the move is two-tiles, empty the source tile
+        if abs(r_dest - r_src) == 2 or abs(c_dest - c_src) == 2:
+            self.mine &= ~(1 << (r_src * n + c_src))
+
+    def check_endgame(self) -> tuple[bool, int, int]:
+        """
+        Same as check_endgame, from this board's point of view.
+
+        Returns
+        -------
+        is_endgame : bool
+            Whether the game ends.
+        mine_score : int
+            The score of mine.
+        opp_score : int
+            The score of opp.
+        """
+        mine_score = bin(self.mine).count("1")
+        opp_score = bin(self.opp).count("1")
+        is_endgame = self.empty() == 0
+
+        # Handle special case where one player is totally eliminated
+        if mine_score == 0:
+            opp_score = self.n * self.n
+            is_endgame = True
+        elif opp_score == 0:
+            mine_score = self.n * self.n
+            is_endgame = True
+
+        return is_endgame, mine_score, opp_score
+
+
+# Per board size ByteBoard tables, built on first use
+_BYTE_MOVE_CACHE: dict[int, list[tuple[tuple[int, int], ...]]] = {}
+_BYTE_NEIGHBOR_CACHE: dict[int, list[tuple[int, ...]]] = {}
+
+def _byte_moves(board_size: int) -> list[tuple[tuple[int, int], ...]]:
+    """
+    For every square, (flat destination index, packed move) for each on-board destination, in _ALL_DIRS order.
+    """
+    if board_size not in _BYTE_MOVE_CACHE:
+        _BYTE_MOVE_CACHE[board_size] = [
+            tuple(
+                ((r + dr) * board_size + c + dc, encode_move(r, c, r + dr, c + dc))
+                for dr, dc in _ALL_DIRS
+                if 0 <= r + dr < board_size and 0 <= c + dc < board_size
+            )
+            for r in range(board_size)
+            for c in range(board_size)
+        ]
+    return _BYTE_MOVE_CACHE[board_size]
+
+def _byte_neighbors(board_size: int) -> list[tuple[int, ...]]:
+    """
+    For every square, the flat indices of its (up to 8) on-board adjacent squares.
+    """
+    if board_size not in _BYTE_NEIGHBOR_CACHE:
+        _BYTE_NEIGHBOR_CACHE[board_size] = [
+            tuple(
+                (r + dr) * board_size + c + dc
+                for dr, dc in _DIRS_8
+                if 0 <= r + dr < board_size and 0 <= c + dc < board_size
+            )
+            for r in range(board_size)
+            for c in range(board_size)
+        ]
+    return _BYTE_NEIGHBOR_CACHE[board_size]
+
+
+class ByteBoard:
+    """
+    ByteBoard stores the board as a flat bytearray of n * n squares, square (r, c) at index r * n + c, with the
+    same values as a chess_board (0 empty, 1 and 2 players, 3 obstacles).
+    Reading a square gives a plain int instead of a numpy scalar, and counting uses bytearray.count, so on the
+    small boards played here it skips numpy's per call overhead entirely. Moves are packed ints (see encode_move).
+
+    np.asarray(byte_board) is a zero copy (n, n) uint8 view of the squares, for the UI or the other helpers.
+    """
+    __slots__ = ("cells", "n")
+
+    def __init__(self, cells: bytearray, n: int):
+        self.cells = cells
+        self.n = n
+
+    '''
+    Build a ByteBoard from a numpy chess_board
+    '''
+    @classmethod
+    def from_numpy(cls, chess_board) -> "ByteBoard":
+        return cls(bytearray(chess_board.astype(np.uint8).tobytes()), chess_board.shape[0])
+
+    '''
+    Return a copy of the board as an int8 numpy chess_board
+    '''
+    def to_numpy(self) -> np.ndarray:
+        return np.frombuffer(self.cells, dtype=np.uint8).reshape(self.n, self.n).astype(np.int8)
+
+    '''
+    Numpy array interface, so numpy can view the squares without copying them
+    '''
+    @property
+    def __array_interface__(self) -> dict:
+        return np.frombuffer(self.cells, dtype=np.uint8).reshape(self.n, self.n).__array_interface__
+
+    '''
+    Return the value of square (r, c)
+    '''
+    def __getitem__(self, tile: tuple[int, int]) -> int:
+        return self.cells[tile[0] * self.n + tile[1]]
+
+    '''
+    Return a copy of this board
+    '''
+    def copy(self) -> "ByteBoard":
+        return ByteBoard(self.cells[:], self.n)
+
+    def valid_moves(self, player: int) -> list[int]:
+        """
+        Get all valid moves for player, as packed moves (see encode_move), in the same order as get_valid_move_array.
+
+        Returns
+        -------
+        valid_moves : [int]
+        """
+        cells = self.cells
+        valid_moves = []
+        for src, moves in enumerate(_byte_moves(self.n)):
+            if cells[src] == player:
+                valid_moves.extend(move for dest, move in moves if cells[dest] == 0)
+        return valid_moves
+
+    def execute_move(self, move: int, player: int):
+        """
+        Play a packed move for player, in place. The move must come from valid_moves.
+        """
+        r_src, c_src, r_dest, c_dest = decode_move(move)
+        n = self.n
+        cells = self.cells
+        opponent = 3 - player
+        dest = r_dest * n + c_dest
+
+        cells[dest] = player
+        for adj in _byte_neighbors(n)[dest]:
+            if cells[adj] == opponent:
+                cells[adj] = player
+
+        # If the move is two-tiles, empty the source tile
+        if abs(r_dest - r_src) == 2 or abs(c_dest - c_src) == 2:
+            cells[r_src * n + c_src] = 0
+
+    def check_endgame(self) -> tuple[bool, int, int]:
+        """
+        Same as check_endgame.
+
+        Returns
+        -------
+        is_endgame : bool
+            Whether the game ends.
+        player_1_score : int
+            The score of player 1.
+        player_2_score : int
+            The score of player 2.
+        """
+        cells = self.cells
+        is_endgame = cells.count(0) == 0
+        p0_score = cells.count(1)
+        p1_score = cells.count(2)
+
+        # Handle special case where one player is totally eliminated
+        if p0_score == 0:
+            p1_score = len(cells)
+            is_endgame = True
+        elif p1_score == 0:
+            p0_score = len(cells)
+            is_endgame = True
+
+        return is_endgame, p0_score, p1_score
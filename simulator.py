@@ -1,16 +1,29 @@
 from world import World, PLAYER_1_NAME, PLAYER_2_NAME
 import argparse
 from utils import all_logging_disabled
+from helpers import seed_random_move
 import logging
 import numpy as np
 import datetime
 import os
+import random
+from concurrent.futures import ProcessPoolExecutor
 
 logging.basicConfig(format="%(levelname)s:%(message)s", level=logging.INFO)
 
 logger = logging.getLogger(__name__)
 
 
+def _positive_int(value):
+    """
+    argparse type for counts that must be at least 1
+    """
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {value}")
+    return number
+
+
 def get_args():
     parser = argparse.ArgumentParser()
     parser.add_argument("--player_1", type=str, default="random_agent")
@@ -28,10 +41,53 @@ def get_args():
     parser.add_argument("--display_save_path", type=str, default="plots/")
     parser.add_argument("--autoplay", action="store_true", default=False)
     parser.add_argument("--autoplay_runs", type=int, default=100)
+    parser.add_argument(
+        "--autoplay_workers",
+        type=_positive_int,
+        default=1,
+        help="In autoplay mode, the number of games played in parallel. Games sharing CPUs inflate the reported turn times, so this defaults to 1",
+    )
     args = parser.parse_args()
     return args
 
 
+def _run_one(args, seed, swap_players, board_fpath):
+    """
+    Play a single autoplay game. This can run in a worker process, so it is kept at module level to be picklable.
+
+    Parameters
+    ----------
+    args : argparse.Namespace
+    seed : np.random.SeedSequence
+        seeds helpers.random_move and the numpy and python global RNGs used by the agents
+    swap_players : bool
+        if True, swap the players
+    board_fpath : str
+        the board to play on
+
+    Returns
+    -------
+    results: tuple
+        (player_1_score, player_2_score, player_1_times, player_2_times) for args.player_1 and args.player_2,
+        whichever side they played on
+    """
+    seed_random_move(seed)
+    np.random.seed(seed.generate_state(1))
+    random.seed(int(seed.generate_state(1)[0]))
+    with all_logging_disabled():
+        p0_score, p1_score, p0_time, p1_time = Simulator(args).run(
+            swap_players=swap_players, board_fpath=board_fpath
+        )
+    if swap_players:
+        p0_score, p1_score, p0_time, p1_time = (
+            p1_score,
+            p0_score,
+            p1_time,
+            p0_time,
+        )
+    return p0_score, p1_score, p0_time, p1_time
+
+
 class Simulator:
     """
     Entry point of the game simulator.
@@ -43,6 +99,9 @@ class Simulator:
 
     def __init__(self, args):
         self.args = args
+        # Keep the SeedSequence itself to spawn per game seeds from, Generator.bit_generator.seed_seq needs numpy>=1.25
+        self.seed_seq = np.random.SeedSequence()
+        self.rng = np.random.default_rng(self.seed_seq)
 
         # if board_roster_dir was passed, add all file paths inside it to a list and save here
         if hasattr(self.args, "board_roster_dir") and self.args.board_roster_dir:
@@ -108,29 +167,30 @@ class Simulator:
         if self.args.display:
             logger.warning("Since running autoplay mode, display will be disabled")
         self.args.display = False
-        with all_logging_disabled():
-            for i in range(self.args.autoplay_runs):
-                swap_players = i % 2 == 0
-                board_fpath = self.board_options[ np.random.randint(len(self.board_options)) ] 
-                p0_score, p1_score, p0_time, p1_time = self.run(
-                    swap_players=swap_players, board_fpath=board_fpath
-                )
-                if swap_players:
-                    p0_score, p1_score, p0_time, p1_time = (
-                        p1_score,
-                        p0_score,
-                        p1_time,
-                        p0_time,
-                    )
-                if p0_score > p1_score:
-                    p1_win_count += 1
-                elif p0_score < p1_score:
-                    p2_win_count += 1
-                else:  # Tie
-                    p1_win_count += 0.5
-                    p2_win_count += 0.5
-                p1_times.extend(p0_time)
-                p2_times.extend(p1_time)
+
+        # Games are independent, so each gets its own seed and can be farmed out to worker processes
+        runs = range(self.args.autoplay_runs)
+        swaps = [i % 2 == 0 for i in runs]
+        board_fpaths = [self.board_options[i] for i in self.rng.integers(len(self.board_options), size=len(runs))]
+        seeds = self.seed_seq.spawn(self.args.autoplay_runs)
+        games = ([self.args] * self.args.autoplay_runs, seeds, swaps, board_fpaths)
+        if self.args.autoplay_workers == 1:
+            # Play in this process, so agent errors surface with their original traceback
+            results = map(_run_one, *games)
+        else:
+            with ProcessPoolExecutor(max_workers=self.args.autoplay_workers) as executor:
+                results = list(executor.map(_run_one, *games))
+
+        for p0_score, p1_score, p0_time, p1_time in results:
+            if p0_score > p1_score:
+                p1_win_count += 1
+            elif p0_score < p1_score:
+                p2_win_count += 1
+            else:  # Tie
+                p1_win_count += 0.5
+                p2_win_count += 0.5
+            p1_times.extend(p0_time)
+            p2_times.extend(p1_time)
 
         logger.info(
             f"Player 1, agent {self.args.player_1}, win percentage: {p1_win_count / self.args.autoplay_runs}. Maximum turn time was {np.round(np.max(p1_times),5)} seconds."
@@ -0,0 +1,111 @@
+"""
+Differential tests: BitBoard, ByteBoard, fast_helpers and make_move_with_undo each reimplement the move and
+endgame rules, so play random games and check every one of them agrees with helpers move for move.
+Every move played is also checked against check_move_validity and count_disc_count_change.
+"""
+import os
+
+import numpy as np
+import pytest
+
+import fast_helpers
+import helpers
+
+BOARDS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "boards")
+BOARD_FILES = sorted(fname for fname in os.listdir(BOARDS_DIR) if fname.endswith(".csv"))
+GAMES_PER_BOARD = 3
+
+
+def play_and_compare(chess_board, rng):
+    """
+    Play one random game on chess_board, asserting every representation matches helpers after each move
+    """
+    start = chess_board.copy()
+    fast_board = chess_board.copy()
+    undo_board = chess_board.copy()
+    undo_stack = []
+    byte_board = helpers.ByteBoard.from_numpy(chess_board)
+    bit_board = helpers.BitBoard.from_numpy(chess_board, 1) # Kept from player 1's point of view
+
+    player = 1
+    for _ in range(3 * chess_board.size):
+        valid_moves = helpers.get_valid_move_array(chess_board, player, cache=False).tolist()
+        assert helpers.get_valid_move_array(chess_board, player).tolist() == valid_moves
+        assert fast_helpers.get_valid_move_array(fast_board, player).tolist() == valid_moves
+        assert byte_board.valid_moves(player) == valid_moves
+        player_bits = bit_board if player == 1 else bit_board.swapped()
+        assert sorted(player_bits.valid_moves()) == sorted(valid_moves)
+
+        if valid_moves:
+            move = valid_moves[rng.integers(len(valid_moves))]
+            assert helpers.check_move_validity(chess_board, helpers.MoveCoordinates.from_packed(move), player)
+            gained = helpers.count_disc_count_change(chess_board, move, player)
+            discs_before = np.count_nonzero(chess_board == player)
+            helpers.execute_move(chess_board, move, player)
+            assert np.count_nonzero(chess_board == player) - discs_before == gained
+            fast_helpers.execute_move(fast_board, helpers.MoveCoordinates.from_packed(move), player)
+            undo_stack.append(helpers.make_move_with_undo(undo_board, move, player))
+            byte_board.execute_move(move, player)
+            player_bits.execute_move(move)
+            bit_board = player_bits if player == 1 else player_bits.swapped()
+
+        assert np.array_equal(fast_board, chess_board)
+        assert np.array_equal(undo_board, chess_board)
+        assert np.array_equal(np.asarray(byte_board), chess_board)
+        assert np.array_equal(bit_board.to_numpy(1), chess_board)
+
+        results = helpers.check_endgame(chess_board)
+        assert byte_board.check_endgame() == results
+        assert bit_board.check_endgame() == results
+        if results[0]:
+            break
+        player = 3 - player
+
+    # Taking every move back in reverse order restores the starting board
+    while undo_stack:
+        helpers.undo_move(undo_board, undo_stack.pop())
+    assert np.array_equal(undo_board, start)
+
+
+@pytest.mark.parametrize("board_file", BOARD_FILES)
+def test_board_files(board_file):
+    rng = np.random.default_rng(0)
+    for _ in range(GAMES_PER_BOARD):
+        chess_board = np.loadtxt(os.path.join(BOARDS_DIR, board_file), dtype=np.int8, delimiter=",")
+        play_and_compare(chess_board, rng)
+
+
+@pytest.mark.parametrize("board_size", range(6, 13))
+def test_random_boards(board_size):
+    rng = np.random.default_rng(board_size)
+    for _ in range(GAMES_PER_BOARD):
+        chess_board = rng.choice([0, 0, 0, 0, 3], size=(board_size, board_size)).astype(np.int8)
+        chess_board[0, 0], chess_board[-1, -1] = 1, 1
+        chess_board[0, -1], chess_board[-1, 0] = 2, 2
+        play_and_compare(chess_board, rng)
+
+
+@pytest.mark.parametrize("src, dest", [
+    ((0, 0), (-1, 0)),  # Destination off the board
+    ((0, 0), (0, 7)),   # Destination off the board, still fits in a packed move
+    ((-1, 0), (0, 0)),  # Source off the board
+    ((0, 0), (1, 1)),   # Destination occupied
+    ((0, 0), (0, 3)),   # Three tiles away
+    ((0, 6), (0, 5)),   # Source owned by the opponent
+    ((3, 3), (3, 4)),   # Source empty
+])
+def test_invalid_moves(src, dest):
+    chess_board = np.loadtxt(os.path.join(BOARDS_DIR, "empty_7x7.csv"), dtype=np.int8, delimiter=",")
+    chess_board[1, 1] = 2
+    start = chess_board.copy()
+    move = helpers.MoveCoordinates(src, dest)
+
+    assert not helpers.check_move_validity(chess_board, move, 1)
+    assert helpers.count_disc_count_change(chess_board, move, 1) == -1
+    with pytest.raises(Exception, match="invalid move"):
+        helpers.execute_move(chess_board, move, 1)
+    with pytest.raises(Exception, match="invalid move"):
+        fast_helpers.execute_move(chess_board, move, 1)
+    with pytest.raises(Exception, match="invalid move"):
+        helpers.make_move_with_undo(chess_board, move, 1)
+    assert np.array_equal(chess_board, start)
@@ -9,7 +9,7 @@ import logging
 from store import AGENT_REGISTRY
 from constants import *
 import sys
-from helpers import check_move_validity, execute_move, check_endgame, random_move, get_valid_moves, MoveCoordinates
+from helpers import check_move_validity, execute_move, check_endgame, random_move, get_valid_moves, MoveCoordinates, clear_valid_move_cache
 
 logging.basicConfig(format="%(levelname)s:%(message)s", level=logging.INFO)
 
@@ -90,10 +90,13 @@ class World:
             self.board_fpath = board_fpath
             logger.info(f"Setting board path to {self.board_fpath}")
 
-        # Initialize the game board from file
-        self.chess_board = np.loadtxt(self.board_fpath, dtype=int, delimiter=',')
+        # Initialize the game board from file. Squares only hold 0-3, so one byte each keeps the board cache friendly
+        self.chess_board = np.loadtxt(self.board_fpath, dtype=np.int8, delimiter=',')
         self.board_size = self.chess_board.shape[0] # We assume it is always square
 
+        # Positions cached during the last game won't come up again, don't let them pile up across autoplay games
+        clear_valid_move_cache()
+
         # Whose turn to step
         self.turn = 0
         
@@ -179,6 +182,10 @@ class World:
                 time_taken = time() - start_time
                 self.update_player_time(time_taken)
 
+                # Agents may also return a packed move (see helpers.encode_move)
+                if not isinstance(move_coords, MoveCoordinates):
+                    move_coords = MoveCoordinates.from_packed(move_coords)
+
                 if not check_move_validity(self.chess_board, move_coords, cur_player):
                     raise ValueError(f"Invalid move by player {cur_player}: SRC {move_coords.get_src()}, DEST {move_coords.get_dest()}")
 